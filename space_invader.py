@@ -7,6 +7,7 @@ A single-file Space Invaders-style game using Python and Pygame
 import pygame
 import random
 import math
+from functools import lru_cache
 
 # Game Setup & Constants
 SCREEN_WIDTH = 800
@@ -26,10 +27,25 @@ ALIEN_ROWS = 5
 ALIEN_COLS = 10
 ALIEN_WIDTH = 40
 ALIEN_HEIGHT = 30
+ALIEN_COL_SPACING = ALIEN_WIDTH + 10  # Distance between the left edges of adjacent columns
 PLAYER_WIDTH = 50
 PLAYER_HEIGHT = 30
 BULLET_WIDTH = 3
 BULLET_HEIGHT = 10
+ALIEN_SHOT_DELAYS = range(2000, 5001)  # Milliseconds between an alien's shots
+
+def _batched_shot_delays():
+    """Yield random alien shot delays, drawn from the generator in batches"""
+    while True:
+        yield from random.choices(ALIEN_SHOT_DELAYS, k=256)
+
+_shot_delays = _batched_shot_delays()
+
+# Sprite images shared by every alien and every bullet
+ALIEN_IMAGE = pygame.Surface([ALIEN_WIDTH, ALIEN_HEIGHT])
+ALIEN_IMAGE.fill(RED)
+BULLET_IMAGE = pygame.Surface([BULLET_WIDTH, BULLET_HEIGHT])
+BULLET_IMAGE.fill(WHITE)
 
 class Player(pygame.sprite.Sprite):
     """Represents the player's ship"""
@@ -42,7 +58,7 @@ class Player(pygame.sprite.Sprite):
         self.rect.x = SCREEN_WIDTH // 2 - PLAYER_WIDTH // 2
         self.rect.y = SCREEN_HEIGHT - PLAYER_HEIGHT - 10
         self.speed = PLAYER_SPEED
-        self.bullets = []  # List to track multiple bullets
+        self.active_bullets = 0  # Number of this player's bullets on screen
         self.max_bullets = 2  # Maximum bullets allowed on screen
     
     def update(self, keys):
@@ -54,35 +70,30 @@ class Player(pygame.sprite.Sprite):
     
     def shoot(self):
         """Create and return a new bullet"""
-        if len(self.bullets) < self.max_bullets:
-            bullet = Bullet(self.rect.centerx, self.rect.top, -1)
-            self.bullets.append(bullet)
+        if self.active_bullets < self.max_bullets:
+            bullet = PlayerBullet(self, self.rect.centerx, self.rect.top)
+            self.active_bullets += 1
             return bullet
         return None
 
 class Alien(pygame.sprite.Sprite):
     """Represents a single alien enemy"""
     
-    def __init__(self, x, y):
+    def __init__(self, x, y, col):
         super().__init__()
-        self.image = pygame.Surface([ALIEN_WIDTH, ALIEN_HEIGHT])
-        self.image.fill(RED)
+        self.image = ALIEN_IMAGE
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
-        self.direction = 1  # 1 for right, -1 for left
+        self.col = col  # Formation column, stable since the swarm moves as one
         self.last_shot = 0
-        self.shot_delay = random.randint(2000, 5000)  # Longer delay between shots
-    
-    def update(self, current_time, speed):
-        """Update alien position"""
-        self.rect.x += speed * self.direction
+        self.shot_delay = next(_shot_delays)  # Longer delay between shots
     
     def should_shoot(self, current_time):
         """Check if alien should shoot"""
         if current_time - self.last_shot > self.shot_delay:
             self.last_shot = current_time
-            self.shot_delay = random.randint(2000, 5000)
+            self.shot_delay = next(_shot_delays)
             return True
         return False
 
@@ -91,8 +102,7 @@ class Bullet(pygame.sprite.Sprite):
     
     def __init__(self, x, y, direction):
         super().__init__()
-        self.image = pygame.Surface([BULLET_WIDTH, BULLET_HEIGHT])
-        self.image.fill(WHITE)
+        self.image = BULLET_IMAGE
         self.rect = self.image.get_rect()
         self.rect.x = x - BULLET_WIDTH // 2
         self.rect.y = y
@@ -109,15 +119,105 @@ class Bullet(pygame.sprite.Sprite):
             return True  # Signal that bullet was destroyed
         return False
 
+class PlayerBullet(Bullet):
+    """Represents a projectile fired by the player"""
+    
+    def __init__(self, owner, x, y):
+        super().__init__(x, y, -1)
+        self.owner = owner
+    
+    def kill(self):
+        """Remove the bullet and free up the owner's bullet slot"""
+        if self.alive():
+            self.owner.active_bullets -= 1
+        super().kill()
+
+class AlienSwarm(pygame.sprite.RenderUpdates):
+    """Sprite group of aliens indexed by formation column"""
+    
+    def __init__(self, *aliens):
+        self.columns = {}  # Formation column -> living aliens in it
+        self.bottom_by_col = {}  # Formation column -> lowest living alien
+        self.alien_list = []  # Living aliens in the order they were added
+        self.rects = []  # Their rects, shared with the sprites and in the same order
+        self.bounds = None  # Bounding rect of the living aliens, moved along with the swarm
+        self.direction = 1  # 1 for right, -1 for left
+        super().__init__(*aliens)
+    
+    def add_internal(self, alien, layer=None):
+        """Add an alien, replacing its column's bottom alien if it is lower"""
+        super().add_internal(alien, layer)
+        self.alien_list.append(alien)
+        self.rects.append(alien.rect)
+        self.columns.setdefault(alien.col, []).append(alien)
+        self.bounds = alien.rect.copy() if self.bounds is None else self.bounds.union(alien.rect)
+        bottom = self.bottom_by_col.get(alien.col)
+        if bottom is None or alien.rect.y > bottom.rect.y:
+            self.bottom_by_col[alien.col] = alien
+    
+    def remove_internal(self, alien):
+        """Remove an alien, rescanning its column only if it was the bottom one"""
+        super().remove_internal(alien)
+        index = self.alien_list.index(alien)
+        del self.alien_list[index]
+        del self.rects[index]
+        column_aliens = self.columns[alien.col]
+        column_aliens.remove(alien)
+        if not column_aliens:
+            del self.columns[alien.col]
+            del self.bottom_by_col[alien.col]
+        elif self.bottom_by_col[alien.col] is alien:
+            self.bottom_by_col[alien.col] = max(column_aliens, key=lambda a: a.rect.y)
+        # The bounds only shrink when an alien on their edge dies
+        if not self.rects:
+            self.bounds = None
+        elif (alien.rect.left == self.bounds.left or alien.rect.right == self.bounds.right
+                or alien.rect.bottom == self.bounds.bottom):
+            self.bounds = self.rects[0].unionall(self.rects)
+    
+    def move(self, speed):
+        """Move the bounds and every alien sideways by speed pixels"""
+        dx = speed * self.direction
+        self.bounds.x += dx
+        for rect in self.rects:
+            rect.x += dx
+    
+    def drop(self):
+        """Reverse the swarm's direction and move it down a step"""
+        self.direction *= -1
+        for rect in self.rects:
+            rect.y += ALIEN_DROP
+        self.bounds.y += ALIEN_DROP
+    
+    def get_bounds(self):
+        """Get the bounding rect of all living aliens"""
+        return self.bounds
+    
+    def get_colliding_alien(self, rect):
+        """Get the first living alien overlapping rect, or None"""
+        if not self.alien_list:
+            return None
+        # The swarm moves as one, so every column sits at a fixed offset from any alien
+        ref = self.alien_list[0]
+        origin_x = ref.rect.x - ref.col * ALIEN_COL_SPACING
+        # Only test the columns whose x range overlaps the rect
+        first_col = (rect.left - ALIEN_WIDTH - origin_x) // ALIEN_COL_SPACING + 1
+        last_col = -((origin_x - rect.right) // ALIEN_COL_SPACING) - 1
+        for col in range(first_col, last_col + 1):
+            for alien in self.columns.get(col, ()):
+                if rect.colliderect(alien.rect):
+                    return alien
+        return None
+
 def setup_aliens():
     """Create and return a group of aliens in a grid formation"""
-    aliens = pygame.sprite.Group()
+    aliens = AlienSwarm()
     
     for row in range(ALIEN_ROWS):
         for col in range(ALIEN_COLS):
-            x = col * (ALIEN_WIDTH + 10) + 50
+            x = col * ALIEN_COL_SPACING + 50
             y = row * (ALIEN_HEIGHT + 10) + 50
-            alien = Alien(x, y)
+            alien = Alien(x, y, col)
             aliens.add(alien)
     
     return aliens
@@ -126,14 +226,11 @@ def check_collisions(player, player_bullets, alien_bullets, aliens, score):
     """Check for collisions between game objects"""
     # Player bullets hitting aliens
     for bullet in player_bullets:
-        alien_hit = pygame.sprite.spritecollideany(bullet, aliens)
+        alien_hit = aliens.get_colliding_alien(bullet.rect)
         if alien_hit:
             bullet.kill()
             alien_hit.kill()
             score += 10
-            # Remove the bullet from player's bullet list
-            if bullet in player.bullets:
-                player.bullets.remove(bullet)
     
     # Alien bullets hitting player
     for bullet in alien_bullets:
@@ -143,21 +240,28 @@ def check_collisions(player, player_bullets, alien_bullets, aliens, score):
     
     return False, score  # No player hit, return updated score
 
+@lru_cache(maxsize=256)
+def render_text(font, text, color):
+    """Render text once and reuse the surface while the text stays the same"""
+    return font.render(text, True, color)
+
 def draw_ui(screen, score, lives, font):
     """Draw the UI elements (score and lives)"""
     # Draw score
-    score_text = font.render(f"Score: {score}", True, WHITE)
-    screen.blit(score_text, (10, 10))
+    score_text = render_text(font, f"Score: {score}", WHITE)
+    score_rect = screen.blit(score_text, (10, 10))
     
     # Draw lives
-    lives_text = font.render(f"Lives: {lives}", True, WHITE)
-    screen.blit(lives_text, (SCREEN_WIDTH - lives_text.get_width() - 10, 10))
+    lives_text = render_text(font, f"Lives: {lives}", WHITE)
+    lives_rect = screen.blit(lives_text, (SCREEN_WIDTH - lives_text.get_width() - 10, 10))
+    
+    return [score_rect, lives_rect]
 
 def draw_game_over(screen, message, font):
     """Draw game over or win message"""
-    text = font.render(message, True, WHITE)
+    text = render_text(font, message, WHITE)
     text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-    screen.blit(text, text_rect)
+    return screen.blit(text, text_rect)
 
 def main():
     """Main game function"""
@@ -167,11 +271,24 @@ def main():
     clock = pygame.time.Clock()
     font = pygame.font.Font(None, 36)
     
+    # Pre-render the end of game messages
+    render_text(font, "GAME OVER", WHITE)
+    render_text(font, "YOU WIN!", WHITE)
+    
     # Game state
     player = Player()
     aliens = setup_aliens()
-    player_bullets = pygame.sprite.Group()
-    alien_bullets = pygame.sprite.Group()
+    player_bullets = pygame.sprite.RenderUpdates()
+    alien_bullets = pygame.sprite.RenderUpdates()
+    
+    # Rendering state: sprites are erased and redrawn onto the background each
+    # frame and only the rects that changed are pushed to the display
+    background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    background.fill(BLACK)
+    sprite_groups = [pygame.sprite.RenderUpdates(player), aliens, player_bullets, alien_bullets]
+    ui_rects = []
+    screen.blit(background, (0, 0))
+    pygame.display.flip()
     
     # Game variables
     score = 0
@@ -191,14 +308,25 @@ def main():
     
     # Game loop
     running = True
+    needs_redraw = True
     while running:
         current_time = pygame.time.get_ticks()
         
+        if game_over or win:
+            # Nothing moves once the game has ended, so sleep until an event arrives
+            events = [pygame.event.wait(100)] + pygame.event.get()
+        else:
+            events = pygame.event.get()
+        
         # Handle events
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
             
+            # The window contents were lost, so push the whole last frame again
+            if event.type == pygame.WINDOWEXPOSED:
+                pygame.display.flip()
+            
             if not game_over and not win:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_SPACE:
@@ -211,35 +339,26 @@ def main():
             keys = pygame.key.get_pressed()
             player.update(keys)
             
-            # Update bullets and clean up off-screen bullets
-            for bullet in list(player_bullets):
-                if bullet.update():
-                    # Bullet went off screen, remove from player's bullet list
-                    if bullet in player.bullets:
-                        player.bullets.remove(bullet)
-            
+            # Update bullets, off-screen bullets remove themselves
+            player_bullets.update()
             alien_bullets.update()
             
             # Handle alien movement with timing
             if current_time - last_alien_move > alien_move_delay:
                 aliens_need_drop = False
                 
-                # Check if any alien hits screen edge
-                for alien in aliens:
-                    if alien.rect.left <= 0 or alien.rect.right >= SCREEN_WIDTH:
-                        aliens_need_drop = True
-                        break
+                # Check if the swarm hits a screen edge
+                bounds = aliens.get_bounds()
+                if bounds.left <= 0 or bounds.right >= SCREEN_WIDTH:
+                    aliens_need_drop = True
                 
                 # Move all aliens
-                for alien in aliens:
-                    alien.update(current_time, alien_speed)
+                aliens.move(alien_speed)
                 
                 # Handle alien swarm drop and direction change
                 if aliens_need_drop and current_time - last_alien_drop > alien_drop_cooldown:
                     # Change direction for all aliens and drop them down
-                    for alien in aliens:
-                        alien.direction *= -1
-                        alien.rect.y += ALIEN_DROP
+                    aliens.drop()
                     # Increase alien speed by 0.5 when they drop
                     alien_speed += 0.5
                     last_alien_drop = current_time
@@ -250,12 +369,9 @@ def main():
             if current_time - last_alien_shot > global_alien_shot_cooldown:
                 # Find bottom aliens in each column that want to shoot
                 shooting_aliens = []
-                for alien in aliens:
+                for alien in aliens.bottom_by_col.values():
                     if alien.should_shoot(current_time):
-                        # Only bottom aliens in each column can shoot
-                        column_aliens = [a for a in aliens if a.rect.x == alien.rect.x]
-                        if alien == max(column_aliens, key=lambda a: a.rect.y):
-                            shooting_aliens.append(alien)
+                        shooting_aliens.append(alien)
                 
                 # Let one random alien shoot
                 if shooting_aliens:
@@ -276,10 +392,8 @@ def main():
                     pygame.time.wait(1000)
             
             # Check if aliens reached the bottom
-            for alien in aliens:
-                if alien.rect.bottom >= player.rect.top:
-                    game_over = True
-                    break
+            if aliens and aliens.get_bounds().bottom >= player.rect.top:
+                game_over = True
             
             # Check if all aliens are destroyed (win condition)
             if len(aliens) == 0:
@@ -288,25 +402,32 @@ def main():
             # Speed up aliens as they are destroyed
             alien_speed = ALIEN_SPEED + (ALIEN_ROWS * ALIEN_COLS - len(aliens)) // 10
         
-        # Draw everything
-        screen.fill(BLACK)
-        
-        # Draw game objects
-        screen.blit(player.image, player.rect)
-        aliens.draw(screen)
-        player_bullets.draw(screen)
-        alien_bullets.draw(screen)
-        
-        # Draw UI
-        draw_ui(screen, score, lives, font)
-        
-        # Draw game over or win message
-        if game_over:
-            draw_game_over(screen, "GAME OVER", font)
-        elif win:
-            draw_game_over(screen, "YOU WIN!", font)
+        # Draw everything, the final frame is left on screen once the game has ended
+        if needs_redraw:
+            # Erase everything drawn last frame
+            for group in sprite_groups:
+                group.clear(screen, background)
+            for rect in ui_rects:
+                screen.blit(background, rect, rect)
+            dirty_rects = list(ui_rects)
+            
+            # Draw game objects
+            for group in sprite_groups:
+                dirty_rects += group.draw(screen)
+            
+            # Draw UI
+            ui_rects = draw_ui(screen, score, lives, font)
+            
+            # Draw game over or win message
+            if game_over:
+                ui_rects.append(draw_game_over(screen, "GAME OVER", font))
+            elif win:
+                ui_rects.append(draw_game_over(screen, "YOU WIN!", font))
+            
+            dirty_rects += ui_rects
+            pygame.display.update(dirty_rects)
         
-        pygame.display.flip()
+        needs_redraw = not (game_over or win)
         clock.tick(60)
     
     pygame.quit()
@@ -6,7 +6,8 @@ A single-file Tetris-style game using Python and Pygame
 
 import pygame
 import random
-import time
+from collections import deque, namedtuple
+from functools import lru_cache
 
 # Game Setup & Constants
 SCREEN_WIDTH = 800
@@ -32,6 +33,15 @@ ORANGE = (255, 165, 0)
 # Tetromino colors
 COLORS = [BLACK, CYAN, YELLOW, MAGENTA, GREEN, RED, BLUE, ORANGE]
 
+def _make_tile(color):
+    """Create a surface the size of a cell's inner area filled with color"""
+    tile = pygame.Surface((CELL_SIZE - 2, CELL_SIZE - 2))
+    tile.fill(color)
+    return tile
+
+# Pre-filled cell tiles for each color index, blitted instead of drawing rects
+TILE_SURFS = {idx: _make_tile(COLORS[idx]) for idx in range(1, len(COLORS))}
+
 # Tetromino shapes (I, O, T, S, Z, J, L)
 SHAPES = [
     # I piece
@@ -56,6 +66,54 @@ SHAPES = [
      [1, 1, 1]]
 ]
 
+# Bitmask with one bit set for every column of a row
+FULL_ROW_MASK = (1 << GRID_WIDTH) - 1
+
+def _rotate(shape):
+    """Rotate a shape 90 degrees clockwise"""
+    return [list(row) for row in zip(*shape[::-1])]
+
+def _all_rotations(shape):
+    """Get the shape in each of its four rotations"""
+    rotations = [shape]
+    for _ in range(3):
+        rotations.append(_rotate(rotations[-1]))
+    return rotations
+
+def _row_masks(shape):
+    """Convert a shape into a tuple of row bitmasks (bit x set iff column x is filled)"""
+    return tuple(sum(1 << x for x, cell in enumerate(row) if cell) for row in shape)
+
+def _placements(masks):
+    """Get the row bitmasks shifted to every column where they fit on the board"""
+    width = max(mask.bit_length() for mask in masks)
+    return [tuple(mask << x for mask in masks) for x in range(GRID_WIDTH - width + 1)]
+
+def _cell_offsets(shape):
+    """Convert a shape into a list of (dx, dy) offsets of its filled cells"""
+    return [(x, y) for y, row in enumerate(shape) for x, cell in enumerate(row) if cell]
+
+# Row bitmasks for every shape and rotation, indexed as PIECE_MASKS[shape_idx][rotation][dy]
+PIECE_MASKS = [[_row_masks(rot) for rot in _all_rotations(shape)] for shape in SHAPES]
+
+# Row bitmasks already shifted into place, indexed as PIECE_PLACEMENTS[shape_idx][rotation][x]
+PIECE_PLACEMENTS = [[_placements(masks) for masks in rotations] for rotations in PIECE_MASKS]
+
+# Filled cell offsets for every shape and rotation, indexed as PIECE_CELLS[shape_idx][rotation]
+PIECE_CELLS = [[_cell_offsets(rot) for rot in _all_rotations(shape)] for shape in SHAPES]
+
+# (min_dx, max_dx, max_dy) of the filled cells, indexed as PIECE_BBOXES[shape_idx][rotation]
+PIECE_BBOXES = [[(min(dx for dx, _ in cells), max(dx for dx, _ in cells), max(dy for _, dy in cells))
+                 for cells in rotations] for rotations in PIECE_CELLS]
+
+# (dx, dy) offsets tried in order when rotating, so pieces can rotate away from walls and the stack;
+# the upward kick is only allowed once per piece
+KICKS = [(0, 0), (-1, 0), (1, 0), (0, -1)]
+
+# Values that decide what is on screen; a frame is only redrawn when they differ
+# from the ones last drawn
+ScreenState = namedtuple('ScreenState', ['pieces_locked', 'piece_position', 'game_over'])
+
 class Piece:
     """Class to manage the current falling piece"""
     
@@ -63,131 +121,160 @@ class Piece:
         self.shape_idx = shape_idx
         self.color_idx = color_idx
         self.shape = SHAPES[shape_idx]
+        self.placements = PIECE_PLACEMENTS[shape_idx]
         self.x = GRID_WIDTH // 2 - len(self.shape[0]) // 2
         self.y = 0
         self.rotation = 0
-    
-    def get_rotated_shape(self):
-        """Get the current shape with rotation applied"""
-        shape = self.shape
-        for _ in range(self.rotation):
-            # Rotate 90 degrees clockwise
-            shape = list(zip(*shape[::-1]))
-            shape = [list(row) for row in shape]
-        return shape
+        self.kicked_up = False  # Upward kicks are allowed once per piece
     
     def get_cells(self):
         """Get the current cells occupied by this piece"""
-        rotated_shape = self.get_rotated_shape()
-        cells = []
-        for y, row in enumerate(rotated_shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    cells.append((self.x + x, self.y + y))
-        return cells
+        return [(self.x + dx, self.y + dy) for dx, dy in PIECE_CELLS[self.shape_idx][self.rotation]]
+    
+    def get_position(self):
+        """Get everything that determines where this piece is drawn"""
+        return self.shape_idx, self.rotation, self.x, self.y
 
 def create_grid():
-    """Create an empty game grid"""
-    return [[0 for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
+    """Create an empty game grid as row bitmasks plus per-cell colors for drawing"""
+    # Deques so cleared lines can be replaced at the top without shifting every row
+    grid_rows = deque([0] * GRID_HEIGHT)
+    grid_colors = deque([0 for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT))
+    return grid_rows, grid_colors
+
+def _shape_bags():
+    """Yield shape indices from shuffled bags that each hold every shape once"""
+    while True:
+        bag = list(range(len(SHAPES)))
+        random.shuffle(bag)
+        yield from bag
+
+# Shared 7-bag randomizer, one shuffle per seven pieces
+_shape_sequence = _shape_bags()
 
 def get_random_piece():
     """Get a random tetromino piece"""
-    shape_idx = random.randint(0, len(SHAPES) - 1)
+    shape_idx = next(_shape_sequence)
     color_idx = shape_idx + 1  # Color index corresponds to shape index + 1
     return Piece(shape_idx, color_idx)
 
-def is_valid_position(piece, grid):
+def is_valid_position(piece, grid_rows):
     """Check if a piece's position is valid"""
-    cells = piece.get_cells()
-    for x, y in cells:
-        # Check boundaries
-        if x < 0 or x >= GRID_WIDTH or y >= GRID_HEIGHT:
-            return False
+    # Check boundaries against the piece's bounding box
+    min_dx, max_dx, max_dy = PIECE_BBOXES[piece.shape_idx][piece.rotation]
+    if piece.x + min_dx < 0 or piece.x + max_dx >= GRID_WIDTH or piece.y + max_dy >= GRID_HEIGHT:
+        return False
+    for y, mask in enumerate(piece.placements[piece.rotation][piece.x], piece.y):
         # Check collision with locked pieces (but allow y < 0 for spawning)
-        if y >= 0 and grid[y][x] != 0:
+        if y >= 0 and grid_rows[y] & mask:
             return False
     return True
 
-def lock_piece(piece, grid):
+def lock_piece(piece, grid_rows, grid_colors):
     """Lock a piece into the grid"""
-    cells = piece.get_cells()
-    for x, y in cells:
+    for y, mask in enumerate(piece.placements[piece.rotation][piece.x], piece.y):
+        if 0 <= y < GRID_HEIGHT:
+            grid_rows[y] |= mask
+    for x, y in piece.get_cells():
         if 0 <= y < GRID_HEIGHT and 0 <= x < GRID_WIDTH:
-            grid[y][x] = piece.color_idx
-
-def clear_lines(grid):
-    """Clear completed lines and return the number of lines cleared"""
-    lines_cleared = 0
-    y = GRID_HEIGHT - 1
-    while y >= 0:
-        if all(cell != 0 for cell in grid[y]):
-            # Remove the completed line
-            del grid[y]
-            # Add a new empty line at the top
-            grid.insert(0, [0 for _ in range(GRID_WIDTH)])
-            lines_cleared += 1
-        else:
-            y -= 1
-    return lines_cleared
-
-def is_game_over(piece, grid):
+            grid_colors[y][x] = piece.color_idx
+
+def clear_lines(grid_rows, grid_colors, y_min, y_max):
+    """Clear completed lines between y_min and y_max and return the number of lines cleared"""
+    full_rows = [y for y in range(max(y_min, 0), min(y_max, GRID_HEIGHT - 1) + 1)
+                 if grid_rows[y] == FULL_ROW_MASK]
+    # Going top to bottom, removing a line only shifts the lines above it
+    for y in full_rows:
+        del grid_rows[y]
+        del grid_colors[y]
+        # Add a new empty line at the top
+        grid_rows.appendleft(0)
+        grid_colors.appendleft([0 for _ in range(GRID_WIDTH)])
+    return len(full_rows)
+
+def is_game_over(piece, grid_rows):
     """Check if the game is over"""
-    return not is_valid_position(piece, grid)
+    return not is_valid_position(piece, grid_rows)
 
-def draw_grid(screen):
-    """Draw the grid lines"""
+def create_grid_surface():
+    """Draw the grid lines once onto a transparent surface the size of the board"""
+    grid_surface = pygame.Surface((GRID_WIDTH * CELL_SIZE + 1, GRID_HEIGHT * CELL_SIZE + 1),
+                                  pygame.SRCALPHA)
+    grid_surface.fill((0, 0, 0, 0))
     for x in range(GRID_WIDTH + 1):
-        pygame.draw.line(screen, GRAY,
-                        (GRID_OFFSET_X + x * CELL_SIZE, GRID_OFFSET_Y),
-                        (GRID_OFFSET_X + x * CELL_SIZE, GRID_OFFSET_Y + GRID_HEIGHT * CELL_SIZE))
+        pygame.draw.line(grid_surface, GRAY,
+                        (x * CELL_SIZE, 0),
+                        (x * CELL_SIZE, GRID_HEIGHT * CELL_SIZE))
     
     for y in range(GRID_HEIGHT + 1):
-        pygame.draw.line(screen, GRAY,
-                        (GRID_OFFSET_X, GRID_OFFSET_Y + y * CELL_SIZE),
-                        (GRID_OFFSET_X + GRID_WIDTH * CELL_SIZE, GRID_OFFSET_Y + y * CELL_SIZE))
+        pygame.draw.line(grid_surface, GRAY,
+                        (0, y * CELL_SIZE),
+                        (GRID_WIDTH * CELL_SIZE, y * CELL_SIZE))
+    return grid_surface
 
-def draw_board(screen, grid):
+def draw_board(screen, grid_rows, grid_colors):
     """Draw the locked pieces on the board"""
-    for y in range(GRID_HEIGHT):
-        for x in range(GRID_WIDTH):
-            if grid[y][x] != 0:
-                color = COLORS[grid[y][x]]
-                rect = pygame.Rect(GRID_OFFSET_X + x * CELL_SIZE + 1,
-                                 GRID_OFFSET_Y + y * CELL_SIZE + 1,
-                                 CELL_SIZE - 2, CELL_SIZE - 2)
-                pygame.draw.rect(screen, color, rect)
+    tiles = []
+    for y, row in enumerate(grid_rows):
+        # Visit only the filled cells by walking the set bits of the row
+        while row:
+            x = (row & -row).bit_length() - 1
+            row &= row - 1
+            tiles.append((TILE_SURFS[grid_colors[y][x]],
+                          (GRID_OFFSET_X + x * CELL_SIZE + 1, GRID_OFFSET_Y + y * CELL_SIZE + 1)))
+    screen.blits(tiles, doreturn=False)
 
 def draw_piece(screen, piece):
     """Draw the current falling piece"""
-    cells = piece.get_cells()
-    color = COLORS[piece.color_idx]
-    for x, y in cells:
-        if 0 <= y < GRID_HEIGHT and 0 <= x < GRID_WIDTH:
-            rect = pygame.Rect(GRID_OFFSET_X + x * CELL_SIZE + 1,
-                             GRID_OFFSET_Y + y * CELL_SIZE + 1,
-                             CELL_SIZE - 2, CELL_SIZE - 2)
-            pygame.draw.rect(screen, color, rect)
-
-def draw_window(screen, grid, piece, game_over=False):
-    """Draw the complete game window"""
-    screen.fill(BLACK)
-    
-    # Draw grid and board
-    draw_grid(screen)
-    draw_board(screen, grid)
+    tile = TILE_SURFS[piece.color_idx]
+    screen.blits([(tile, (GRID_OFFSET_X + x * CELL_SIZE + 1, GRID_OFFSET_Y + y * CELL_SIZE + 1))
+                  for x, y in piece.get_cells()
+                  if 0 <= y < GRID_HEIGHT and 0 <= x < GRID_WIDTH], doreturn=False)
+
+@lru_cache(maxsize=None)
+def render_text(text, size, color):
+    """Render text once and reuse the surface on later frames"""
+    font = pygame.font.Font(None, size)
+    return font.render(text, True, color)
+
+def get_piece_rect(piece):
+    """Get the screen rect covering the bounding box of a piece"""
+    min_dx, max_dx, max_dy = PIECE_BBOXES[piece.shape_idx][piece.rotation]
+    return pygame.Rect(GRID_OFFSET_X + (piece.x + min_dx) * CELL_SIZE,
+                       GRID_OFFSET_Y + piece.y * CELL_SIZE,
+                       (max_dx - min_dx + 1) * CELL_SIZE, (max_dy + 1) * CELL_SIZE)
+
+def draw_background(background, grid_surface, grid_rows, grid_colors):
+    """Draw the grid lines and locked pieces onto the background surface"""
+    background.fill(BLACK)
+    background.blit(grid_surface, (GRID_OFFSET_X, GRID_OFFSET_Y))
+    draw_board(background, grid_rows, grid_colors)
+
+def draw_window(screen, background, piece, prev_piece_rect, full_redraw=False, game_over=False):
+    """Draw the changed parts of the game window and return the piece's screen rect"""
+    if full_redraw:
+        screen.blit(background, (0, 0))
+        dirty_rects = [screen.get_rect()]
+    else:
+        # Restore the background where the piece was drawn last frame
+        screen.blit(background, prev_piece_rect, prev_piece_rect)
+        dirty_rects = [prev_piece_rect]
     
     # Draw current piece if game is not over
+    piece_rect = get_piece_rect(piece)
     if not game_over:
         draw_piece(screen, piece)
+        dirty_rects.append(piece_rect)
     
     # Draw game over message
     if game_over:
-        font = pygame.font.Font(None, 74)
-        text = font.render('GAME OVER', True, RED)
+        text = render_text('GAME OVER', 74, RED)
         text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         screen.blit(text, text_rect)
+        dirty_rects.append(text_rect)
     
-    pygame.display.flip()
+    pygame.display.update(dirty_rects)
+    return piece_rect
 
 def main():
     """Main game function"""
@@ -196,51 +283,80 @@ def main():
     pygame.display.set_caption("Tetris")
     clock = pygame.time.Clock()
     
+    # Pre-render the game over message
+    render_text('GAME OVER', 74, RED)
+    
     # Game state
-    grid = create_grid()
+    grid_rows, grid_colors = create_grid()
     current_piece = get_random_piece()
     next_piece = get_random_piece()
     
+    # Pre-rendered grid lines and locked pieces, redrawn only when the board changes
+    background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    grid_surface = create_grid_surface()
+    drawn_state = None
+    prev_piece_rect = get_piece_rect(current_piece)
+    
     # Timing
     fall_time = 0
     fall_speed = 0.5  # seconds per fall
-    last_time = time.time()
     
     # Game loop
     running = True
     game_over = False
+    pieces_locked = 0
     
     while running:
-        current_time = time.time()
-        delta_time = current_time - last_time
-        last_time = current_time
+        # Get the seconds elapsed since the last frame, pacing is done by the event wait
+        delta_time = clock.tick() / 1000.0
+        
+        # Sleep until an event arrives or the frame budget runs out, then drain the queue
+        event = pygame.event.wait(100 if game_over else 16)
         
         # Handle events
-        for event in pygame.event.get():
+        for event in [event] + pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
             
+            # The window contents were lost, so forget what was drawn and repaint everything
+            if event.type == pygame.WINDOWEXPOSED:
+                drawn_state = None
+            
             if not game_over:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_LEFT:
                         current_piece.x -= 1
-                        if not is_valid_position(current_piece, grid):
+                        if not is_valid_position(current_piece, grid_rows):
                             current_piece.x += 1
                     
                     elif event.key == pygame.K_RIGHT:
                         current_piece.x += 1
-                        if not is_valid_position(current_piece, grid):
+                        if not is_valid_position(current_piece, grid_rows):
                             current_piece.x -= 1
                     
                     elif event.key == pygame.K_DOWN:
                         current_piece.y += 1
-                        if not is_valid_position(current_piece, grid):
+                        if not is_valid_position(current_piece, grid_rows):
                             current_piece.y -= 1
                     
                     elif event.key == pygame.K_UP:
-                        current_piece.rotation = (current_piece.rotation + 1) % 4
-                        if not is_valid_position(current_piece, grid):
-                            current_piece.rotation = (current_piece.rotation - 1) % 4
+                        # Keep the first kick offset where the rotated piece fits
+                        old_rotation = current_piece.rotation
+                        current_piece.rotation = (old_rotation + 1) % 4
+                        for dx, dy in KICKS:
+                            # Lifting a grounded piece on every rotation would stall it forever
+                            if dy < 0 and current_piece.kicked_up:
+                                continue
+                            current_piece.x += dx
+                            current_piece.y += dy
+                            if is_valid_position(current_piece, grid_rows):
+                                if dy < 0:
+                                    current_piece.kicked_up = True
+                                break
+                            current_piece.x -= dx
+                            current_piece.y -= dy
+                        else:
+                            current_piece.rotation = old_rotation
         
         if not game_over:
             # Handle automatic falling
@@ -249,26 +365,35 @@ def main():
                 fall_time = 0
                 current_piece.y += 1
                 
-                if not is_valid_position(current_piece, grid):
+                if not is_valid_position(current_piece, grid_rows):
                     current_piece.y -= 1
-                    lock_piece(current_piece, grid)
+                    lock_piece(current_piece, grid_rows, grid_colors)
+                    pieces_locked += 1
+                    # Every rotation has cells in its top row, so y < 0 means the piece
+                    # locked partly above the board (lock out)
+                    locked_out = current_piece.y < 0
                     
-                    # Clear completed lines
-                    lines_cleared = clear_lines(grid)
+                    # Clear completed lines, which can only be in the rows the piece covers
+                    piece_ys = [y for _, y in current_piece.get_cells()]
+                    lines_cleared = clear_lines(grid_rows, grid_colors, min(piece_ys), max(piece_ys))
                     
                     # Spawn new piece
                     current_piece = next_piece
                     next_piece = get_random_piece()
                     
                     # Check for game over
-                    if is_game_over(current_piece, grid):
+                    if locked_out or is_game_over(current_piece, grid_rows):
                         game_over = True
         
-        # Draw everything
-        draw_window(screen, grid, current_piece, game_over)
-        
-        # Cap the frame rate
-        clock.tick(60)
+        # Skip the redraw unless the screen state differs from the last drawn one
+        state = ScreenState(pieces_locked, current_piece.get_position(), game_over)
+        if state != drawn_state:
+            board_changed = drawn_state is None or state.pieces_locked != drawn_state.pieces_locked
+            if board_changed:
+                draw_background(background, grid_surface, grid_rows, grid_colors)
+            prev_piece_rect = draw_window(screen, background, current_piece, prev_piece_rect,
+                                          board_changed, game_over)
+            drawn_state = state
     
     pygame.quit()
 